@@ -1,8 +1,10 @@
 """QQ channel implementation using botpy SDK."""
 
 import asyncio
-from collections import deque
-from typing import TYPE_CHECKING
+import functools
+import weakref
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from loguru import logger
 
@@ -11,40 +13,45 @@ from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import QQConfig
 
-try:
+if TYPE_CHECKING:
     import botpy
     from botpy.message import C2CMessage, GroupMessage
 
-    QQ_AVAILABLE = True
-except ImportError:
-    QQ_AVAILABLE = False
-    botpy = None
-    C2CMessage = None
-    GroupMessage = None
 
-if TYPE_CHECKING:
-    from botpy.message import C2CMessage, GroupMessage
+def _is_progress(msg: OutboundMessage) -> bool:
+    """Whether the message is an agent progress update or tool hint."""
+    return bool((msg.metadata or {}).get("_progress"))
+
+
+def _reply_to(msg: OutboundMessage) -> str | None:
+    """The inbound message ID this message replies to, if any."""
+    return (msg.metadata or {}).get("message_id")
 
 
-def _make_bot_class(channel: "QQChannel") -> "type[botpy.Client]":
-    """Create a botpy Client subclass bound to the given channel."""
+@functools.cache
+def _make_bot_class(botpy: Any) -> "type[botpy.Client]":
+    """Create (once) a botpy Client subclass that forwards events to its QQChannel."""
     intents = botpy.Intents(public_messages=True, public_guild_messages=True, direct_message=True)
 
     class _Bot(botpy.Client):
-        def __init__(self):
+        def __init__(self, channel: "QQChannel"):
             super().__init__(intents=intents)
+            self._qq_channel = weakref.ref(channel)
 
         async def on_ready(self):
             logger.info("QQ bot ready: {}", self.robot.name)
 
         async def on_c2c_message_create(self, message: "C2CMessage"):
-            await channel._on_message(message)
+            if channel := self._qq_channel():
+                await channel._on_message(message)
 
         async def on_group_at_message_create(self, message: "GroupMessage"):
-            await channel._on_group_message(message)
+            if channel := self._qq_channel():
+                await channel._on_group_message(message)
 
         async def on_direct_message_create(self, message):
-            await channel._on_message(message)
+            if channel := self._qq_channel():
+                await channel._on_message(message)
 
     return _Bot
 
@@ -54,15 +61,26 @@ class QQChannel(BaseChannel):
 
     name = "qq"
 
+    _BATCH_MAX_SIZE = 10  # Max queued outbound messages coalesced into one API call
+    _BATCH_MAX_CHARS = 2000  # Max combined content length of a coalesced batch
+    _DRAIN_TIMEOUT = 5.0  # Seconds stop() waits for pending sends to go out
+
     def __init__(self, config: QQConfig, bus: MessageBus):
         super().__init__(config, bus)
         self.config: QQConfig = config
         self._client: "botpy.Client | None" = None
-        self._processed_ids: deque = deque(maxlen=1000)
+        # Bound API methods, resolved once in start()
+        self._post_c2c: Callable[..., Awaitable[Any]] | None = None
+        self._post_group: Callable[..., Awaitable[Any]] | None = None
+        self._processed_ids: OrderedDict[int, None] = OrderedDict()  # Ordered dedup cache of ID hashes
+        self._send_queues: dict[tuple, deque[OutboundMessage]] = {}
+        self._flusher_tasks: dict[tuple, asyncio.Task] = {}
 
     async def start(self) -> None:
         """Start the QQ bot."""
-        if not QQ_AVAILABLE:
+        try:
+            import botpy
+        except ImportError:
             logger.error("QQ SDK not installed. Run: pip install qq-botpy")
             return
 
@@ -71,8 +89,10 @@ class QQChannel(BaseChannel):
             return
 
         self._running = True
-        BotClass = _make_bot_class(self)
-        self._client = BotClass()
+        BotClass = _make_bot_class(botpy)
+        self._client = BotClass(self)
+        self._post_c2c = self._client.api.post_c2c_message
+        self._post_group = self._client.api.post_group_message
 
         logger.info("QQ bot started (C2C + group chat)")
         await self._run_bot()
@@ -91,6 +111,11 @@ class QQChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the QQ bot."""
         self._running = False
+        await self._drain()
+        for task in self._flusher_tasks.values():
+            task.cancel()
+        self._flusher_tasks.clear()
+        self._send_queues.clear()
         if self._client:
             try:
                 await self._client.close()
@@ -98,36 +123,105 @@ class QQChannel(BaseChannel):
                 pass
         logger.info("QQ bot stopped")
 
+    async def _drain(self) -> None:
+        """Wait at most _DRAIN_TIMEOUT seconds for queued outbound messages to be sent."""
+        if self._flusher_tasks:
+            _, pending = await asyncio.wait(
+                list(self._flusher_tasks.values()), timeout=self._DRAIN_TIMEOUT
+            )
+            if pending:
+                logger.warning("QQ stop timed out with {} chat(s) still sending", len(pending))
+
     async def send(self, msg: OutboundMessage) -> None:
-        """Send a message through QQ."""
+        """Queue a message for its destination's flusher without waiting on the QQ API."""
         if not self._client:
             logger.warning("QQ client not initialized")
             return
+        self._enqueue(msg)
+
+    def _enqueue(self, msg: OutboundMessage) -> None:
+        """Add a message to its destination batch, starting a flusher if needed."""
+        metadata = msg.metadata or {}
+        key = (msg.chat_id, metadata.get("msg_type"), metadata.get("group_openid"))
+        queue = self._send_queues.setdefault(key, deque())
+        queue.append(msg)
+        if key not in self._flusher_tasks:
+            self._flusher_tasks[key] = asyncio.create_task(self._flush_loop(key, queue))
+
+    async def _flush_loop(self, key: tuple, queue: deque[OutboundMessage]) -> None:
+        """
+        Drain one destination's queue, sending each batch as a single API call.
+
+        Only messages already queued (e.g. while the previous post was in flight)
+        are coalesced, in order. Progress messages are always sent on their own, and
+        a batch ends where the replied-to message_id changes.
+        """
+        try:
+            while queue:
+                batch = [queue.popleft()]
+                size = len(batch[0].content)
+                while (
+                    queue
+                    and len(batch) < self._BATCH_MAX_SIZE
+                    and size + 1 + len(queue[0].content) <= self._BATCH_MAX_CHARS
+                    and not _is_progress(batch[0])
+                    and not _is_progress(queue[0])
+                    and _reply_to(queue[0]) == _reply_to(batch[0])
+                ):
+                    size += 1 + len(queue[0].content)
+                    batch.append(queue.popleft())
+                if await self._post(batch[0], "\n".join(m.content for m in batch)):
+                    continue
+                if len(batch) > 1:
+                    logger.warning(
+                        "QQ batched send of {} messages failed, retrying one by one", len(batch)
+                    )
+                    for msg in batch:
+                        await self._post(msg, msg.content)
+        finally:
+            if self._flusher_tasks.get(key) is asyncio.current_task():
+                del self._flusher_tasks[key]
+                self._send_queues.pop(key, None)
+
+    async def _post(self, msg: OutboundMessage, content: str) -> bool:
+        """Send content to the destination of the given message; return False on failure."""
         try:
             metadata = msg.metadata or {}
             if metadata.get("msg_type") == "group":
-                await self._client.api.post_group_message(
+                await self._post_group(
                     group_openid=metadata["group_openid"],
                     msg_type=0,
-                    content=msg.content,
+                    content=content,
                     msg_id=metadata.get("message_id"),
                 )
             else:
-                await self._client.api.post_c2c_message(
+                await self._post_c2c(
                     openid=msg.chat_id,
                     msg_type=0,
-                    content=msg.content,
+                    content=content,
                 )
         except Exception as e:
             logger.error("Error sending QQ message: {}", e)
+            return False
+        return True
+
+    def _seen(self, mid: str) -> bool:
+        """Return True if the message ID was already processed, otherwise record it."""
+        # Store the 64-bit hash rather than the ID string; collisions are negligible at this size
+        key = hash(mid)
+        if key in self._processed_ids:
+            return True
+        self._processed_ids[key] = None
+        if len(self._processed_ids) > 1000:
+            self._processed_ids.popitem(last=False)
+        return False
 
     async def _on_message(self, data: "C2CMessage") -> None:
         """Handle incoming C2C/direct message from QQ."""
         try:
             # Dedup by message ID
-            if data.id in self._processed_ids:
+            if self._seen(data.id):
                 return
-            self._processed_ids.append(data.id)
 
             author = data.author
             user_id = str(getattr(author, 'id', None) or getattr(author, 'user_openid', 'unknown'))
@@ -148,9 +242,8 @@ class QQChannel(BaseChannel):
         """Handle incoming group @bot message from QQ."""
         try:
             # Dedup by message ID
-            if data.id in self._processed_ids:
+            if self._seen(data.id):
                 return
-            self._processed_ids.append(data.id)
 
             group_openid = data.group_openid
             member_openid = data.author.member_openid
@@ -160,8 +253,7 @@ class QQChannel(BaseChannel):
             # The @mention typically appears as a leading slash or whitespace-prefixed segment
             # botpy delivers it with a leading space after the mention; strip it
             if content.startswith("/"):
-                content = content[1:].strip()
-            content = content.strip()
+                content = content[1:].lstrip()
             if not content:
                 return
 
@@ -392,8 +392,15 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
-    
-    asyncio.run(run())
+
+    # uvloop (optional, nanobot-ai[speed]) speeds up the WebSocket-heavy channel I/O
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(run())
 
 
 
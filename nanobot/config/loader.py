@@ -2,14 +2,34 @@
 
 import json
 import os
+import stat
+import sys
 from pathlib import Path
 from typing import Any
 
 from nanobot.config.schema import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Environment variable prefix and delimiter
 ENV_PREFIX = "NANOBOT_"
 ENV_DELIMITER = "__"
+_PREFIX_LEN = len(ENV_PREFIX)
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse JSON, using orjson when available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when available."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 
 def get_config_path() -> Path:
@@ -25,22 +45,27 @@ def get_data_dir() -> Path:
 
 def _parse_env_value(value: str) -> Any:
     """Parse environment variable value to appropriate Python type."""
-    if value.lower() == "true":
+    lowered = value.lower()
+    if lowered == "true":
         return True
-    if value.lower() == "false":
+    if lowered == "false":
         return False
-    try:
-        return int(value)
-    except ValueError:
-        pass
-    try:
-        return float(value)
-    except ValueError:
-        pass
-    if value.startswith(("[", "{")):
+    # Most values are plain strings (keys, tokens, model names); only attempt
+    # conversions whose leading character makes them possible.
+    first = value[:1]
+    if first and first in "+-.0123456789":
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    elif first and first in "[{":
+        try:
+            return _loads(value)
+        except ValueError:
             pass
     return value
 
@@ -58,7 +83,10 @@ def _get_env_overrides() -> dict[str, Any]:
     for key, value in os.environ.items():
         if not key.startswith(ENV_PREFIX):
             continue
-        path = key[len(ENV_PREFIX):].lower().split(ENV_DELIMITER)
+        suffix = key[_PREFIX_LEN:]
+        if not suffix:
+            continue
+        path = [sys.intern(part.lower()) for part in suffix.split(ENV_DELIMITER)]
         parsed = _parse_env_value(value)
         current = result
         for part in path[:-1]:
@@ -69,12 +97,17 @@ def _get_env_overrides() -> dict[str, Any]:
 
 def _deep_merge(base: dict, override: dict) -> dict:
     """Deep merge dicts. Override takes precedence."""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
-        else:
-            result[key] = value
+    # Shallow-copy only the dicts on the override's path; untouched branches are shared
+    result = dict(base)
+    stack = [(result, override)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            if isinstance(value, dict) and isinstance(dst.get(key), dict):
+                dst[key] = dict(dst[key])
+                stack.append((dst[key], value))
+            else:
+                dst[key] = value
     return result
 
 
@@ -100,8 +133,7 @@ def load_config(config_path: Path | None = None) -> Config:
     file_data: dict[str, Any] = {}
     if path.exists():
         try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
+            data = _loads(path.read_bytes())
             data = _migrate_config(data)
             file_data = data
         except (json.JSONDecodeError, ValueError) as e:
@@ -110,7 +142,12 @@ def load_config(config_path: Path | None = None) -> Config:
 
     # Merge: env overrides take precedence
     env_overrides = _get_env_overrides()
-    merged = _deep_merge(file_data, env_overrides)
+    if not env_overrides:
+        merged = file_data
+    elif not file_data:
+        merged = env_overrides
+    else:
+        merged = _deep_merge(file_data, env_overrides)
 
     return Config.model_validate(merged) if merged else Config()
 
@@ -123,13 +160,27 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
         config: Configuration to save.
         config_path: Optional path to save to. Uses default if not provided.
     """
-    path = config_path or get_config_path()
+    # Resolve symlinks so the rename replaces the target, not the link
+    path = (config_path or get_config_path()).resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
 
     data = config.model_dump(by_alias=True)
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Write to a sibling temp file and rename so a crash never leaves a partial config.
+    # The config holds API keys: keep the existing file's mode, or 0600 for a new one.
+    mode = stat.S_IMODE(path.stat().st_mode) if path.exists() else 0o600
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        with os.fdopen(os.open(tmp, flags, 0o600), "wb") as f:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def _migrate_config(data: dict) -> dict:
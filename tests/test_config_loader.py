@@ -0,0 +1,116 @@
+import os
+import stat
+
+import pytest
+
+from nanobot.config import loader
+from nanobot.config.loader import (
+    _deep_merge,
+    _get_env_overrides,
+    _parse_env_value,
+    load_config,
+    save_config,
+)
+from nanobot.config.schema import Config
+
+
+def test_env_overrides_build_nested_dict(monkeypatch) -> None:
+    monkeypatch.setenv("NANOBOT_AGENTS__DEFAULTS__MODEL", "GLM-4.6")
+    monkeypatch.setenv("NANOBOT_GATEWAY__PORT", "8080")
+
+    overrides = _get_env_overrides()
+
+    assert overrides["agents"] == {"defaults": {"model": "GLM-4.6"}}
+    assert overrides["gateway"] == {"port": 8080}
+
+
+def test_save_and_load_config_round_trip(tmp_path) -> None:
+    path = tmp_path / "config.json"
+    config = Config()
+    config.agents.defaults.model = "测试-model"
+
+    save_config(config, path)
+
+    assert "测试-model" in path.read_text(encoding="utf-8")
+    assert not path.with_suffix(".json.tmp").exists()
+    assert load_config(path).agents.defaults.model == "测试-model"
+
+
+def test_deep_merge_overrides_nested_keys_without_mutating_base() -> None:
+    base = {"agents": {"defaults": {"model": "a", "maxTokens": 10}}, "tools": {"web": {}}}
+    override = {"agents": {"defaults": {"model": "b"}}, "gateway": {"port": 1}}
+
+    merged = _deep_merge(base, override)
+
+    assert merged == {
+        "agents": {"defaults": {"model": "b", "maxTokens": 10}},
+        "tools": {"web": {}},
+        "gateway": {"port": 1},
+    }
+    assert base["agents"]["defaults"]["model"] == "a"
+
+
+def test_parse_env_value_types() -> None:
+    assert _parse_env_value("TRUE") is True
+    assert _parse_env_value("false") is False
+    assert _parse_env_value("-42") == -42
+    assert _parse_env_value("0.5") == 0.5
+    assert _parse_env_value('["a", 1]') == ["a", 1]
+    assert _parse_env_value('{"k": "v"}') == {"k": "v"}
+    assert _parse_env_value("[not json") == "[not json"
+    assert _parse_env_value("sk-abc123") == "sk-abc123"
+    assert _parse_env_value("123abc") == "123abc"
+    assert _parse_env_value("") == ""
+
+
+def _assert_json_round_trip() -> None:
+    data = {"name": "测试", "nested": {"items": [1, 2.5, True, None]}}
+    raw = loader._dumps(data)
+
+    assert isinstance(raw, bytes)
+    assert "测试" in raw.decode("utf-8")
+    assert b'\n  "name"' in raw
+    assert loader._loads(raw) == data
+    assert loader._loads(raw.decode("utf-8")) == data
+    with pytest.raises(ValueError):
+        loader._loads(b"{not json")
+
+
+def test_json_helpers_with_stdlib(monkeypatch) -> None:
+    monkeypatch.setattr(loader, "orjson", None)
+    _assert_json_round_trip()
+
+
+def test_json_helpers_with_orjson(monkeypatch) -> None:
+    monkeypatch.setattr(loader, "orjson", pytest.importorskip("orjson"))
+    _assert_json_round_trip()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_save_config_preserves_mode_and_symlink(tmp_path) -> None:
+    target = tmp_path / "real.json"
+    target.write_text("{}", encoding="utf-8")
+    target.chmod(0o600)
+    link = tmp_path / "config.json"
+    link.symlink_to(target)
+
+    save_config(Config(), link)
+
+    assert link.is_symlink()
+    assert stat.S_IMODE(target.stat().st_mode) == 0o600
+    assert loader._loads(target.read_bytes())["agents"]
+
+
+def test_save_config_removes_temp_file_on_failure(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "config.json"
+    path.write_text('{"keep": true}', encoding="utf-8")
+
+    def _fail(_data):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(loader, "_dumps", _fail)
+    with pytest.raises(RuntimeError):
+        save_config(Config(), path)
+
+    assert path.read_text(encoding="utf-8") == '{"keep": true}'
+    assert list(tmp_path.iterdir()) == [path]
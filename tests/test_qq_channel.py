@@ -0,0 +1,215 @@
+import asyncio
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.qq import QQChannel, _make_bot_class
+from nanobot.config.schema import QQConfig
+
+
+def _make_channel() -> QQChannel:
+    return QQChannel(QQConfig(enabled=True, app_id="app", secret="secret"), MessageBus())
+
+
+class _FakeApi:
+    def __init__(self) -> None:
+        self.c2c_calls: list[dict] = []
+        self.group_calls: list[dict] = []
+
+    async def post_c2c_message(self, **kwargs) -> None:
+        self.c2c_calls.append(kwargs)
+
+    async def post_group_message(self, **kwargs) -> None:
+        self.group_calls.append(kwargs)
+
+
+def _bind_fake_api(channel: QQChannel) -> _FakeApi:
+    api = _FakeApi()
+    channel._client = SimpleNamespace(api=api)
+    channel._post_c2c = api.post_c2c_message
+    channel._post_group = api.post_group_message
+    return api
+
+
+def test_seen_evicts_oldest_ids() -> None:
+    channel = _make_channel()
+
+    assert channel._seen("m0") is False
+    assert channel._seen("m0") is True
+
+    for i in range(1, 1001):
+        channel._seen(f"m{i}")
+
+    assert len(channel._processed_ids) == 1000
+    assert channel._seen("m1000") is True
+    assert channel._seen("m0") is False
+
+
+@pytest.mark.asyncio
+async def test_on_message_drops_duplicate_ids() -> None:
+    channel = _make_channel()
+    data = SimpleNamespace(id="msg-1", content=" hello ", author=SimpleNamespace(user_openid="u1"))
+
+    await channel._on_message(data)
+    await channel._on_message(data)
+
+    assert channel.bus.inbound_size == 1
+    inbound = await channel.bus.consume_inbound()
+    assert inbound.sender_id == "u1"
+    assert inbound.content == "hello"
+
+
+@pytest.mark.asyncio
+async def test_send_coalesces_messages_per_destination() -> None:
+    channel = _make_channel()
+    api = _bind_fake_api(channel)
+
+    group_meta = {"msg_type": "group", "group_openid": "g1", "message_id": "m1"}
+    await channel.send(OutboundMessage(channel="qq", chat_id="u1", content="first"))
+    await channel.send(OutboundMessage(channel="qq", chat_id="u1", content="second"))
+    await channel.send(OutboundMessage(channel="qq", chat_id="g1", content="hi", metadata=group_meta))
+
+    for task in list(channel._flusher_tasks.values()):
+        await task
+
+    assert api.c2c_calls == [{"openid": "u1", "msg_type": 0, "content": "first\nsecond"}]
+    assert api.group_calls == [
+        {"group_openid": "g1", "msg_type": 0, "content": "hi", "msg_id": "m1"}
+    ]
+    assert channel._flusher_tasks == {}
+    assert channel._send_queues == {}
+
+
+@pytest.mark.asyncio
+async def test_send_keeps_progress_and_replies_to_different_messages_apart() -> None:
+    channel = _make_channel()
+    api = _bind_fake_api(channel)
+
+    progress = {"msg_type": "group", "group_openid": "g1", "message_id": "m1", "_progress": True}
+    first = {"msg_type": "group", "group_openid": "g1", "message_id": "m1"}
+    second = {"msg_type": "group", "group_openid": "g1", "message_id": "m2"}
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="g1", content="thinking", metadata=progress))
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="g1", content="answer", metadata=first))
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="g1", content="other", metadata=second))
+
+    for task in list(channel._flusher_tasks.values()):
+        await task
+
+    assert [(c["content"], c["msg_id"]) for c in api.group_calls] == [
+        ("thinking", "m1"),
+        ("answer", "m1"),
+        ("other", "m2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bot_class_is_cached_and_dispatches_to_channel() -> None:
+    class _Client:
+        def __init__(self, intents) -> None:
+            self.intents = intents
+
+    fake_botpy = ModuleType("fake_botpy")
+    fake_botpy.Intents = lambda **kwargs: kwargs
+    fake_botpy.Client = _Client
+
+    bot_class = _make_bot_class(fake_botpy)
+    assert _make_bot_class(fake_botpy) is bot_class
+
+    channel = _make_channel()
+    bot = bot_class(channel)
+    data = SimpleNamespace(id="msg-1", content="hi", author=SimpleNamespace(id="u1"))
+    await bot.on_c2c_message_create(data)
+
+    assert channel.bus.inbound_size == 1
+
+
+@pytest.mark.asyncio
+async def test_on_group_message_strips_leading_mention_slash() -> None:
+    channel = _make_channel()
+    data = SimpleNamespace(
+        id="msg-1",
+        content="  /  ping  ",
+        group_openid="g1",
+        author=SimpleNamespace(member_openid="m1"),
+    )
+
+    await channel._on_group_message(data)
+
+    inbound = await channel.bus.consume_inbound()
+    assert inbound.content == "ping"
+    assert inbound.chat_id == "g1"
+    assert inbound.metadata["group_openid"] == "g1"
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_sends() -> None:
+    channel = _make_channel()
+    api = _bind_fake_api(channel)
+
+    await channel.send(OutboundMessage(channel="qq", chat_id="u1", content="bye"))
+    await channel.stop()
+
+    assert api.c2c_calls == [{"openid": "u1", "msg_type": 0, "content": "bye"}]
+    assert channel._send_queues == {}
+    assert channel._flusher_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_send_preserves_order_behind_in_flight_post() -> None:
+    channel = _make_channel()
+    _bind_fake_api(channel)
+    release = asyncio.Event()
+    sent: list[str] = []
+
+    async def _slow_post(**kwargs) -> None:
+        if kwargs["content"] == "progress...":
+            await release.wait()
+        sent.append(kwargs["content"])
+
+    channel._post_c2c = _slow_post
+    progress = {"message_id": "m1", "_progress": True}
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="u1", content="progress...", metadata=progress))
+    await asyncio.sleep(0)  # progress post is now in flight
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="u1", content="Sorry, I encountered an error."))
+
+    assert len(channel._flusher_tasks) == 1
+    release.set()
+    for task in list(channel._flusher_tasks.values()):
+        await task
+
+    assert sent == ["progress...", "Sorry, I encountered an error."]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_message() -> None:
+    channel = _make_channel()
+    api = _bind_fake_api(channel)
+
+    async def _reject_batches(**kwargs) -> None:
+        if "\n" in kwargs["content"]:
+            raise RuntimeError("content too long")
+        api.c2c_calls.append(kwargs)
+
+    channel._post_c2c = _reject_batches
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="u1", content="one"))
+    channel._enqueue(OutboundMessage(channel="qq", chat_id="u1", content="two"))
+    for task in list(channel._flusher_tasks.values()):
+        await task
+
+    assert [c["content"] for c in api.c2c_calls] == ["one", "two"]
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_combined_length_cap() -> None:
+    channel = _make_channel()
+    channel._BATCH_MAX_CHARS = 10
+    api = _bind_fake_api(channel)
+
+    for content in ("aaaa", "bbbb", "cccc"):
+        channel._enqueue(OutboundMessage(channel="qq", chat_id="u1", content=content))
+    for task in list(channel._flusher_tasks.values()):
+        await task
+
+    assert [c["content"] for c in api.c2c_calls] == ["aaaa\nbbbb", "cccc"]